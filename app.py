@@ -1,9 +1,19 @@
+import os
+import tempfile
+from datetime import date
+from pathlib import Path
 import streamlit as st
-import requests
+import requests_cache
+import orjson
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
-from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from operator import itemgetter
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 import networkx as nx
 import numpy as np
@@ -80,169 +90,286 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+# Shared session so concurrent OpenAlex requests reuse pooled keep-alive connections.
+# Responses are also cached on disk, so they survive app restarts and redeploys; server
+# Cache-Control/ETag headers are honoured, and stale entries are served if OpenAlex errors.
+session = requests_cache.CachedSession('.openalex_cache', backend='sqlite', expire_after=86400,
+                                       cache_control=True, stale_if_error=True)
+# Back off and retry on rate limiting (429) and transient server errors; once retries run
+# out, hand back the last response so callers' status_code checks still apply
+retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                raise_on_status=False)
+session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=16, max_retries=retries))
+# Identify the app to OpenAlex; requests that also carry a contact email (set via
+# OPENALEX_MAILTO) are routed to its faster, higher-rate-limit polite pool
+session.headers['User-Agent'] = 'CitationDashboard (https://github.com/hazemibrahim97/CitationDashboard)'
+OPENALEX_MAILTO = os.environ.get('OPENALEX_MAILTO')
+if OPENALEX_MAILTO:
+    session.params['mailto'] = OPENALEX_MAILTO
+
+# st.plotly_chart re-serializes every figure on each rerun; orjson does that about twice
+# as fast as the default encoder, which matters for the large network figure
+pio.json.config.default_engine = 'orjson'
+
+# Works are snapshots keyed by their OpenAlex id; hashing them by id spares st.cache_data
+# from walking every nested authorship on each rerun
+WORK_HASH_FUNCS = {dict: lambda work: work.get('id', '')}
+
+# Only request the fields each view consumes; full work objects are several times larger
+WORK_FIELDS = 'id,title,publication_year,cited_by_count,authorships,locations'
+CITING_FIELDS = 'id,title,publication_year,locations,referenced_works'
+NETWORK_FIELDS = 'id,authorships'
+
+# The analytics charts are display-only: render them without hover/zoom handlers or
+# the modebar; only the network graph stays interactive
+STATIC_CHART_CONFIG = {'staticPlot': True, 'displayModeBar': False}
+
+# Citing works take one request per batch of 50 works, so they are also snapshotted to
+# disk; new sessions for the same author then skip the whole fetch phase
+CITING_SNAPSHOT_DIR = Path('.citing_cache')
+
+def parse_json(response):
+    """Decode a response body with orjson, which is much faster than the stdlib parser"""
+    return orjson.loads(response.content)
+
 @st.cache_data(ttl=86400, show_spinner=False)  # Cache for 24 hours
 def get_author_data(orcid):
     """Fetch author data from OpenAlex API"""
     base_url = f"https://api.openalex.org/authors/https://orcid.org/{orcid}"
-    response = requests.get(base_url)
+    response = session.get(base_url, timeout=30)
     if response.status_code == 200:
-        return response.json()
+        return parse_json(response)
     return None
 
 @st.cache_data(ttl=86400, show_spinner=False)
 def get_works(author_id):
     """Fetch all works by the author"""
     works = []
-    page = 1
-    per_page = 100
+    cursor = '*'
     
-    while True:
-        url = f"https://api.openalex.org/works?filter=author.id:{author_id}&page={page}&per-page={per_page}"
-        response = requests.get(url)
+    while cursor:
+        url = f"https://api.openalex.org/works?filter=author.id:{author_id}&per-page=200&cursor={cursor}&select={WORK_FIELDS}"
+        response = session.get(url, timeout=30)
         if response.status_code != 200:
             break
             
-        data = response.json()
+        data = parse_json(response)
         works.extend(data['results'])
         
-        if len(data['results']) < per_page:
-            break
-        page += 1
+        cursor = data['meta'].get('next_cursor') if data['results'] else None
     
     return works
 
 
+class IncompleteFetchError(Exception):
+    """Raised when pagination stops on a non-200 page; carries the results gathered so far"""
+    
+    def __init__(self, partial):
+        super().__init__(f"pagination stopped early after {len(partial)} results")
+        self.partial = partial
+
 @st.cache_data(ttl=86400, show_spinner=False)
-def get_citing_works_with_progress(works):
-    """Wrapper function to show progress while fetching citing works"""
+def get_citing_works(work_ids):
+    """Fetch (id, year, title, venue) tuples for all works citing any of the given works.
+    
+    A non-200 page (e.g. once rate-limit retries run out) raises IncompleteFetchError
+    rather than returning, because st.cache_data never caches exceptions; otherwise a
+    truncated result would be served to every session for the cache lifetime.
+    """
     citing_works = []
-    work_ids = [work['id'] for work in works]
-    total = len(work_ids)
-    progress_bar = st.progress(0)
+    cited = set(work_ids)
+    cites_filter = '|'.join(work_id.rsplit('/', 1)[-1] for work_id in work_ids)
+    cursor = '*'
     
-    for i, work_id in enumerate(work_ids):
-        page = 1
-        per_page = 100
-        
-        while True:
-            url = f"https://api.openalex.org/works?filter=cites:{work_id}&page={page}&per-page={per_page}"
-            response = requests.get(url)
-            if response.status_code == 200:
-                data = response.json()
-                citing_works.extend(data['results'])
-                
-                # Check if there are more pages
-                if len(data['results']) < per_page:
-                    break
-                page += 1
-            else:
-                break
+    while cursor:
+        url = f"https://api.openalex.org/works?filter=cites:{cites_filter}&per-page=200&cursor={cursor}&select={CITING_FIELDS}"
+        response = session.get(url, timeout=30)
+        if response.status_code != 200:
+            raise IncompleteFetchError(citing_works)
+            
+        data = parse_json(response)
+        for work in data['results']:
+            # Keep only the fields shown downstream, not the whole JSON object
+            record = (work['id'], work.get('publication_year'), work.get('title'), get_venue(work))
+            # Emit the citing work once per cited paper, as a per-paper query would
+            n_cited = len(cited.intersection(work.get('referenced_works') or ()))
+            citing_works.extend([record] * max(n_cited, 1))
         
-        # Update progress
-        progress = (i + 1) / total
-        progress_bar.progress(progress)
+        cursor = data['meta'].get('next_cursor') if data['results'] else None
     
-    progress_bar.empty()
     return citing_works
 
+def fetch_citing_batch(work_ids):
+    """Fetch one batch of citing works, returning (tuples, whether every page was fetched)"""
+    try:
+        return get_citing_works(work_ids), True
+    except IncompleteFetchError as error:
+        return error.partial, False
+
+def stream_citing_works(works):
+    """Fetch citing works in concurrent batches, yielding (batch index, tuples, complete, batch count) as each completes"""
+    # Uncited works cannot match a cites: filter, so leave them out of the batches
+    work_ids = [work['id'] for work in works if work.get('cited_by_count')]
+    # OpenAlex accepts up to 100 OR-ed values per filter; 50 keeps URLs short
+    chunks = [tuple(work_ids[i:i + 50]) for i in range(0, len(work_ids), 50)]
+    
+    # Requests are network-bound, so overlap them on a thread pool. Workers carry the
+    # script context so the per-batch st.cache_data lookups work off the main thread.
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(max_workers=16, initializer=add_script_run_ctx, initargs=(None, ctx)) as executor:
+        futures = {executor.submit(fetch_citing_batch, chunk): i
+                   for i, chunk in enumerate(chunks)}
+        for future in as_completed(futures):
+            yield futures[future], *future.result(), len(chunks)
+
+def build_citing_df(citing_works, works_ids_set):
+    """Tabulate citing papers by how many of the author's works they cite"""
+    # One grouped aggregation counts citations per citing paper and keeps its details;
+    # sort=False plus a stable sort keeps first-seen order among equal counts
+    citing_df = (pd.DataFrame(citing_works, columns=['ID', 'Year', 'Title', 'Venue'])
+                 .groupby('ID', sort=False)
+                 .agg(**{'Title': ('Title', 'first'),
+                         'Venue': ('Venue', 'first'),
+                         'Incoming citations': ('ID', 'size')})
+                 .sort_values('Incoming citations', ascending=False, kind='stable')
+                 .reset_index())
+    # Vectorized boolean self-citation flag; the ID column is only needed for this test
+    citing_df['Is Self'] = citing_df.pop('ID').isin(works_ids_set)
+    # Per-paper citation counts fit easily in int32, halving the bytes the sums stream
+    return citing_df.astype({'Incoming citations': 'int32'})
+
+def citing_snapshot_path(author_id):
+    """Path of today's on-disk snapshot of an author's citing works"""
+    # The date tag expires snapshots on the same daily cycle as the API cache
+    return CITING_SNAPSHOT_DIR / f"{author_id.rsplit('/', 1)[-1]}_{date.today():%Y%m%d}.parquet"
+
 @st.cache_data(ttl=86400, show_spinner=False)
-def get_collaborators(works, author_id):
-    """Extract unique collaborators from works, excluding the main author"""
-    collaborators = []
+def read_citing_snapshot(path):
+    """Read a citing-works snapshot; cached so reruns skip the parquet read"""
+    return list(pd.read_parquet(path).itertuples(index=False, name=None))
+
+def load_citing_snapshot(author_id):
+    """Load today's citing-works snapshot for an author, or None if there is none"""
+    try:
+        # The path carries the date, so this memoizes per author and day; failed
+        # reads raise and are therefore never cached
+        return read_citing_snapshot(str(citing_snapshot_path(author_id)))
+    except (OSError, ValueError):
+        # Missing, or unreadable (Arrow errors subclass ValueError): treat as a miss
+        return None
+
+def save_citing_snapshot(author_id, citing_works):
+    """Persist an author's citing works to disk, replacing older snapshots"""
+    path = citing_snapshot_path(author_id)
+    CITING_SNAPSHOT_DIR.mkdir(exist_ok=True)
+    # Write to a private temp file and swap it in atomically, so concurrent sessions
+    # never see a half-written snapshot
+    fd, tmp_path = tempfile.mkstemp(dir=CITING_SNAPSHOT_DIR, suffix='.tmp')
+    os.close(fd)
+    try:
+        pd.DataFrame(citing_works, columns=['ID', 'Year', 'Title', 'Venue']).to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    for old in CITING_SNAPSHOT_DIR.glob(f"{author_id.rsplit('/', 1)[-1]}_*.parquet"):
+        if old != path:
+            old.unlink(missing_ok=True)
+
+def build_authorship_frame(works):
+    """Flatten works into one row per (work, authorship, institution) for vectorized analytics"""
+    rows = []
     for work in works:
-        for author in work.get('authorships', []):
-            if (author.get('author') and 
-                author['author'].get('id') != author_id):  # Exclude main author
-                collaborators.append({
-                    'name': author['author'].get('display_name'),
-                    'id': author['author'].get('id')
-                })
-    return [c for c in collaborators if c['name'] is not None]
+        authorships = work.get('authorships') or []
+        for position, authorship in enumerate(authorships):
+            author = authorship.get('author') or {}
+            row = (work['id'], work.get('publication_year'), len(authorships), position,
+                   author.get('id'), author.get('display_name'))
+            # Authorships without an institution still get a single row
+            for inst in authorship.get('institutions') or [{}]:
+                rows.append(row + (inst.get('id'), inst.get('display_name')))
+    
+    auth_df = pd.DataFrame.from_records(rows, columns=[
+        'w_id', 'w_year', 'w_n_authors', 'position_idx',
+        'author_id', 'author_name', 'inst_id', 'inst_name'
+    ])
+    # Ids repeat across rows, so store them as categories; years and positions fit int16
+    return auth_df.astype({
+        'w_id': 'category',
+        'w_year': 'Int16',
+        'w_n_authors': 'int16',
+        'position_idx': 'int16',
+        'author_id': 'category',
+        'inst_id': 'category'
+    })
+
+@st.cache_data(ttl=86400, show_spinner=False, hash_funcs=WORK_HASH_FUNCS)
+def flatten_authorships(works):
+    """Cached authorship frame for an author's WORK_FIELDS works, keyed by work ids alone"""
+    # Only the main works go through here; the network's NETWORK_FIELDS projection of the
+    # same ids lacks years, so it uses the uncached builder to avoid colliding on the key
+    return build_authorship_frame(works)
+
+def count_values(values, label, count_label):
+    """Build a most-frequent-first count table from a Series with one hash-based pass"""
+    return values.value_counts().rename_axis(label).reset_index(name=count_label)
+
+@st.cache_data(ttl=86400, show_spinner=False)
+def get_collaborators(auth_df, author_id):
+    """Extract collaborator names (one per co-authorship), excluding the main author"""
+    authorships = auth_df.drop_duplicates(['w_id', 'position_idx'])
+    mask = (authorships['author_id'] != author_id) & authorships['author_name'].notna()  # Exclude main author
+    return authorships.loc[mask, 'author_name']
 
 @st.cache_data(ttl=86400, show_spinner=False)
 def get_institutions(affiliations):
     """Extract unique institutions from affiliations"""
+    seen = set()
     institutions = []
     for affiliation in affiliations:
-        if affiliation.get('display_name') not in institutions:
-            institutions.append(affiliation['institution'].get('display_name'))
+        name = (affiliation.get('institution') or {}).get('display_name')
+        if name and name not in seen:
+            seen.add(name)
+            institutions.append(name)
             
     return institutions
 
 @st.cache_data(ttl=86400, show_spinner=False)
 def get_institutions_single(affiliations):
-    """Extract unique institutions from affiliations"""
-    
-    try:
-        insts = get_institutions(affiliations)
-        
-        if len(insts) == 0:
-            return insts[0]
-        
-        if len(insts) > 2:
-            return ", ".join(insts[:2])
-        else:
-            return ", ".join(insts)
-
-    except:
-        return 'Unknown institution'
-    
+    """Format up to two institutions from affiliations for the search dropdown"""
+    institutions = get_institutions(affiliations or [])
+    return ", ".join(institutions[:2]) or 'Unknown institution'
 
-@st.cache_data(ttl=86400, show_spinner=False)
 def get_venue(work):
     """Extract venue from work"""
-    try:
-        venue = work.get('locations', {})[0]
-        venue = venue.get('source', {})
-        venue = venue.get('display_name', 'N/A')
-        return venue
-    except:
-        return 'N/A'
-
-def get_author_position(work, author_id):
-    """Determine if author is first, last, or middle author"""
-    authors = work.get('authorships', [])
-    if not authors:
-        return 'Unknown'
-    
-    author_positions = [i for i, author in enumerate(authors) 
-                       if author.get('author', {}).get('id') == author_id]
-    
-    if not author_positions:
-        return 'Unknown'
-    
-    position = author_positions[0]
-    if position == 0:
-        return 'First Author'
-    elif position == len(authors) - 1:
-        return 'Last Author'
-    else:
-        return 'Middle Author'
-
-def create_publication_position_chart(works, author_id):
-    """Create temporal chart of publications by author position"""
-    # Extract year and position for each publication
-    pub_data = []
-    for work in works:
-        year = work.get('publication_year')
-        position = get_author_position(work, author_id)
-        if year and position != 'Unknown':
-            pub_data.append({'Year': year, 'Position': position})
+    # Empty or missing locations fall back to a sentinel, so nothing can raise
+    locations = work.get('locations') or [{}]
+    return (locations[0].get('source') or {}).get('display_name', 'N/A')
+
+@st.cache_data(ttl=86400, show_spinner=False)
+def get_position_counts(auth_df, author_id):
+    """Count publications per year by author position"""
+    # Keep the author's first slot on every dated publication
+    mine = auth_df[(auth_df['author_id'] == author_id) & auth_df['w_year'].notna()]
+    mine = mine.drop_duplicates('w_id')
+    positions = np.select([mine['position_idx'] == 0, mine['position_idx'] == mine['w_n_authors'] - 1],
+                          ['First Author', 'Last Author'], 'Middle Author')
     
     # Create DataFrame and count publications by year and position
-    df = pd.DataFrame(pub_data)
-    df_grouped = df.groupby(['Year', 'Position']).size().reset_index(name='Count')
-    
-    # Create the figure
-    fig = px.bar(df_grouped, 
-                 x='Year', 
-                 y='Count',
-                 color='Position',
-                 title='Publications per Year by Author Position',
-                 labels={'Count': 'Number of Publications'},
-                 barmode='stack')
+    df = pd.DataFrame({'Year': mine['w_year'].astype(int), 'Position': positions})
+    return df.groupby(['Year', 'Position']).size().unstack(fill_value=0)
+
+def create_publication_position_chart(auth_df, author_id):
+    """Create temporal chart of publications by author position"""
+    counts = get_position_counts(auth_df, author_id)
+    
+    # Create the figure with one stacked trace per position
+    fig = go.Figure([go.Bar(name=position, x=counts.index, y=counts[position])
+                     for position in counts.columns])
     
     fig.update_layout(
+        title='Publications per Year by Author Position',
+        barmode='stack',
         xaxis_title="Year",
         yaxis_title="Number of Publications",
         legend_title="Author Position",
@@ -252,30 +379,23 @@ def create_publication_position_chart(works, author_id):
     
     return fig
 
-def create_citation_chart(citing_works, work_ids):
+def create_citation_chart(citing_works, works_ids_set):
     """Create temporal chart of citations received"""
-
-    cite_data = []
-    for work in citing_works:
-        year = work.get('publication_year')
-        is_self = 'Self Citation' if work['id'] in works_ids else 'External Citation'
-        if year:
-            cite_data.append({'Year': year, 'Type': is_self})
-    
-    # Create DataFrame and count citations by year and type
-    df = pd.DataFrame(cite_data)
-    df_grouped = df.groupby(['Year', 'Type']).size().reset_index(name='Count')
-    
-    # Create the figure
-    fig = px.bar(df_grouped, 
-                 x='Year', 
-                 y='Count',
-                 color='Type',
-                 title='Citations Received per Year',
-                 labels={'Count': 'Number of Citations'},
-                 barmode='stack')
+    # Build the columns once and classify self-citations with a vectorized membership test
+    df = pd.DataFrame(citing_works, columns=['ID', 'Year', 'Title', 'Venue']).dropna(subset=['Year'])
+    df['Year'] = df['Year'].astype(int)
+    df['Type'] = np.where(df['ID'].isin(works_ids_set), 'Self Citation', 'External Citation')
+    
+    # Count citations by year and type
+    counts = df.groupby(['Year', 'Type']).size().unstack(fill_value=0)
+    
+    # Create the figure with one stacked trace per citation type
+    fig = go.Figure([go.Bar(name=cite_type, x=counts.index, y=counts[cite_type])
+                     for cite_type in counts.columns])
     
     fig.update_layout(
+        title='Citations Received per Year',
+        barmode='stack',
         xaxis_title="Year",
         yaxis_title="Number of Citations",
         legend_title="Citation Type",
@@ -285,32 +405,31 @@ def create_citation_chart(citing_works, work_ids):
     
     return fig
 
-def create_unique_collaborators_chart(works, author_id):
-    """Create chart showing number of unique collaborators per year"""
-    # Track collaborators by year
-    yearly_collaborators = {}
+@st.cache_data(ttl=86400, show_spinner=False)
+def build_year_stats(auth_df, author_id):
+    """Aggregate per-year collaborator and team-size statistics from the flattened authorships"""
+    # One row per authorship on dated works, in chronological (stable) order
+    authorships = (auth_df[auth_df['w_year'].notna()]
+                   .drop_duplicates(['w_id', 'position_idx'])
+                   .sort_values('w_year', kind='stable'))
+    papers = authorships.drop_duplicates('w_id').groupby('w_year')
     
-    # Sort works by year to track unique collaborators chronologically
-    sorted_works = sorted(works, key=lambda x: x.get('publication_year', 0))
+    # A collaborator is new the first time they appear chronologically
+    collabs = authorships[authorships['author_id'].notna() & (authorships['author_id'] != author_id)]
+    is_new = ~collabs['author_id'].duplicated()
     
-    for work in sorted_works:
-        year = work.get('publication_year')
-        if not year:
-            continue
-            
-        if year not in yearly_collaborators:
-            yearly_collaborators[year] = set()
-            
-        for author in work.get('authorships', []):
-            if (author.get('author') and 
-                author['author'].get('id') != author_id):
-                yearly_collaborators[year].add(author['author'].get('id'))
-    
-    # Create data for plotting
-    plot_data = pd.DataFrame([
-        {'Year': year, 'Unique Collaborators': len(collaborators)}
-        for year, collaborators in yearly_collaborators.items()
-    ])
+    year_stats = pd.DataFrame({
+        'unique_collabs': collabs.groupby('w_year')['author_id'].nunique(),
+        'new_collabs': collabs[is_new].groupby('w_year').size(),
+        'papers': papers.size(),
+        'team_total': papers['w_n_authors'].sum()
+    }).fillna(0).astype(int)
+    year_stats.index = year_stats.index.astype(int).rename('Year')
+    return year_stats
+
+def create_unique_collaborators_chart(year_stats):
+    """Create chart showing number of unique collaborators per year"""
+    plot_data = year_stats['unique_collabs'].reset_index(name='Unique Collaborators')
     
     fig = px.line(plot_data,
                   x='Year',
@@ -327,43 +446,10 @@ def create_unique_collaborators_chart(works, author_id):
     
     return fig
 
-def create_new_collaborators_chart(works, author_id):
+def create_new_collaborators_chart(year_stats):
     """Create chart showing mean number of new collaborators per paper per year"""
-    # Track all known collaborators chronologically
-    known_collaborators = set()
-    yearly_new_collabs = {}
-    yearly_paper_count = {}
-    
-    # Sort works by year
-    sorted_works = sorted(works, key=lambda x: x.get('publication_year', 0))
-    
-    for work in sorted_works:
-        year = work.get('publication_year')
-        if not year:
-            continue
-            
-        if year not in yearly_new_collabs:
-            yearly_new_collabs[year] = 0
-            yearly_paper_count[year] = 0
-            
-        new_collabs_this_paper = 0
-        for author in work.get('authorships', []):
-            if (author.get('author') and 
-                author['author'].get('id') != author_id):
-                author_id_current = author['author'].get('id')
-                if author_id_current not in known_collaborators:
-                    new_collabs_this_paper += 1
-                    known_collaborators.add(author_id_current)
-        
-        yearly_new_collabs[year] += new_collabs_this_paper
-        yearly_paper_count[year] += 1
-    
     # Calculate mean new collaborators per paper
-    plot_data = pd.DataFrame([
-        {'Year': year,
-         'Mean New Collaborators': yearly_new_collabs[year] / yearly_paper_count[year]}
-        for year in yearly_new_collabs.keys()
-    ])
+    plot_data = (year_stats['new_collabs'] / year_stats['papers']).reset_index(name='Mean New Collaborators')
     
     fig = px.line(plot_data,
                   x='Year',
@@ -380,33 +466,10 @@ def create_new_collaborators_chart(works, author_id):
     
     return fig
 
-def create_team_size_chart(works):
+def create_team_size_chart(year_stats):
     """Create chart showing average team size per paper per year"""
-    # Track team sizes by year
-    yearly_team_sizes = {}
-    yearly_paper_count = {}
-    
-    for work in works:
-        year = work.get('publication_year')
-        if not year:
-            continue
-            
-        if year not in yearly_team_sizes:
-            yearly_team_sizes[year] = 0
-            yearly_paper_count[year] = 0
-        
-        team_size = len(work.get('authorships', []))
-        yearly_team_sizes[year] += team_size
-        yearly_paper_count[year] += 1
-    
     # Calculate mean team size per year
-    plot_data = pd.DataFrame([
-        {'Year': year,
-         'Mean Team Size': yearly_team_sizes[year] / yearly_paper_count[year]}
-        for year in yearly_team_sizes.keys()
-    ])
-    
-    plot_data = plot_data.sort_values('Year')
+    plot_data = (year_stats['team_total'] / year_stats['papers']).reset_index(name='Mean Team Size')
     
     fig = px.line(plot_data,
                   x='Year',
@@ -423,20 +486,21 @@ def create_team_size_chart(works):
     
     return fig
 
-def create_collaboration_distribution_chart(works, author_id):
-    """Create histogram of collaboration frequencies"""
-    # Get all collaborations
-    collaborators = get_collaborators(works, author_id)
-    collab_counts = Counter(c['name'] for c in collaborators)
-    
-    # Create frequency distribution
-    freq_dist = Counter(collab_counts.values())
+@st.cache_data(ttl=86400, show_spinner=False)
+def get_collaboration_frequencies(auth_df, author_id):
+    """Count how many collaborators were worked with once, twice, ..."""
+    # Collaborations per collaborator, then collaborators per collaboration count
+    names = get_collaborators(auth_df, author_id).to_numpy(dtype=str)
+    _, collab_counts = np.unique(names, return_counts=True)
+    freq_dist = np.bincount(collab_counts)
+    counts = np.flatnonzero(freq_dist)
     
     # Convert to DataFrame for plotting
-    plot_data = pd.DataFrame([
-        {'Number of Collaborations': count, 'Frequency': freq}
-        for count, freq in sorted(freq_dist.items())
-    ])
+    return pd.DataFrame({'Number of Collaborations': counts, 'Frequency': freq_dist[counts]})
+
+def create_collaboration_distribution_chart(auth_df, author_id):
+    """Create histogram of collaboration frequencies"""
+    plot_data = get_collaboration_frequencies(auth_df, author_id)
     
     fig = px.bar(plot_data,
                  x='Number of Collaborations',
@@ -458,55 +522,45 @@ def create_collaboration_distribution_chart(works, author_id):
     return fig
 
 @st.cache_data(ttl=86400, show_spinner=False)
-def get_institution_collaborations(works, author_id):
-    """Extract institution collaborations from works"""
-    institution_collabs = []
-    for work in works:
-        for author in work.get('authorships', []):
-            if (not author.get('author') or 
-                author['author'].get('id') == author_id):
-                continue
-                
-            institutions = author.get('institutions', [])
-            for inst in institutions:
-                if inst.get('display_name'):
-                    institution_collabs.append({
-                        'name': inst.get('display_name'),
-                        'id': inst.get('id')
-                    })
-    
-    return [i for i in institution_collabs if i['name'] is not None]
+def get_institution_collaborations(auth_df, author_id):
+    """Extract collaborating institution names (one per co-author affiliation)"""
+    mask = (auth_df['author_id'].notna() & 
+            (auth_df['author_id'] != author_id) & 
+            auth_df['inst_name'].fillna('').astype(bool))
+    return auth_df.loc[mask, 'inst_name']
 
 def calculate_citation_concentration_index(citing_df):
     """Calculate the citation-concentration index"""
-    # Get the list of citation counts
-    citation_counts = citing_df['Incoming citations'].tolist()
-    citation_counts.sort(reverse=True)
-    
-    # Find the largest number n where n papers cite >= n times
-    n = 0
-    for i, citations in enumerate(citation_counts, 1):
-        if citations >= i:
-            n = i
-        else:
-            break
+    # Sort descending in C rather than trusting the caller's row order
+    citation_counts = np.sort(citing_df['Incoming citations'].to_numpy())[::-1]
+    ranks = np.arange(1, citation_counts.size + 1)
     
-    return n
+    # Largest n where n papers cite >= n times: the True prefix of counts >= rank
+    return int((citation_counts >= ranks).sum())
 
 @st.cache_data(ttl=86400, show_spinner=False)
 def get_areas(author_data):
-    """Extract research areas from author data"""
-    topic = author_data.get('topics', [])
-    topics = [t.get('subfield', {}).get('display_name', None) for t in topic]
-    topics = [t for t in topics if t is not None]
-    if len(topics) > 5:
-        return list(set(topics[:5]))
-    else:
-        return list(set(topics))
+    """Extract up to five distinct research areas from author data, in topic order"""
+    areas = {}  # dict keeps insertion order, unlike set
+    for topic in author_data.get('topics', ()):
+        name = (topic.get('subfield') or {}).get('display_name')
+        if name and name not in areas:
+            areas[name] = None
+            if len(areas) == 5:
+                break
+    return list(areas)
+
+def get_collaborator_works(author_id):
+    """Fetch one page of a collaborator's works (authorships only) to expand the network"""
+    url = f"https://api.openalex.org/works?filter=author.id:{author_id}&per-page=100&select={NETWORK_FIELDS}"
+    response = session.get(url, timeout=30)
+    if response.status_code == 200:
+        return parse_json(response)['results']
+    return None
 
 @st.cache_data(ttl=86400, show_spinner=False)
-def get_collaborator_network(works, author_id, author_name, max_depth=2):
-    """Build a network of collaborators up to max_depth"""
+def get_collaborator_network(auth_df, author_id, author_name, max_depth=2, max_fanout=20):
+    """Build a network of collaborators up to max_depth, expanding at most max_fanout per node"""
     G = nx.Graph()
     processed_authors = set()
     
@@ -514,106 +568,97 @@ def get_collaborator_network(works, author_id, author_name, max_depth=2):
     G.add_node(author_id, name=author_name, level=0)
     processed_authors.add(author_id)
     
-    def add_collaborations(works, source_id, level):
+    def add_collaborations(auth_df, source_id, level):
         if level > max_depth:
             return
             
-        # Create a single dictionary to track both counts and info
-        author_data = {}
-        
-        # Single pass through works to collect all data
-        for work in works:
-            for authorship in work['authorships']:
-                target_id = authorship['author'].get('id')
-                if not target_id or target_id == source_id:
-                    continue
-                    
-                if target_id not in author_data:
-                    author_data[target_id] = {
-                        'name': authorship['author'].get('display_name'),
-                        'count': 1
-                    }
-                else:
-                    author_data[target_id]['count'] += 1
+        # Count co-authorships per collaborator from the flattened authorships
+        authorships = auth_df.drop_duplicates(['w_id', 'position_idx'])
+        authorships = authorships[authorships['author_id'].notna() & (authorships['author_id'] != source_id)]
+        author_data = authorships.groupby('author_id', sort=False, observed=True).agg(
+            name=('author_name', 'first'),
+            count=('w_id', 'size')
+        )
         
         # Add nodes and edges for frequent collaborators
-        frequent_collaborators = []
-        for target_id, data in author_data.items():
-            if data['count'] > 2:  # Only add frequent collaborators
-                if target_id not in G:
-                    G.add_node(target_id, name=data['name'], level=level)
-                G.add_edge(source_id, target_id)
-                frequent_collaborators.append(target_id)
+        frequent = author_data[author_data['count'] > 2]  # Only add frequent collaborators
+        for target_id, name in frequent['name'].items():
+            if target_id not in G:
+                G.add_node(target_id, name=name, level=level)
+            G.add_edge(source_id, target_id)
         
         # Process next level
         if level < max_depth:
-            # Batch API calls for next level
-            for target_id in frequent_collaborators:
-                if target_id not in processed_authors:
-                    processed_authors.add(target_id)
-                    collab_works_url = f"https://api.openalex.org/works?filter=author.id:{target_id}&per-page=100"
-                    response = requests.get(collab_works_url)
-                    if response.status_code == 200:
-                        collab_works = response.json()['results']
-                        add_collaborations(collab_works, target_id, level + 1)
+            # Only expand the strongest ties, so prolific authors cannot trigger hundreds of calls
+            strongest = frequent['count'].sort_values(ascending=False, kind='stable').index[:max_fanout]
+            to_expand = [target_id for target_id in strongest if target_id not in processed_authors]
+            processed_authors.update(to_expand)
+            
+            # Fetch the next level concurrently, but only mutate the graph on this thread
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                for target_id, collab_works in zip(to_expand, executor.map(get_collaborator_works, to_expand)):
+                    if collab_works is not None:
+                        add_collaborations(build_authorship_frame(collab_works), target_id, level + 1)
     
     # Start building network
-    add_collaborations(works, author_id, 1)
+    add_collaborations(auth_df, author_id, 1)
     return G
 
+@st.cache_data(ttl=86400, show_spinner=False,
+               hash_funcs={nx.Graph: lambda G: (tuple(G.nodes()), tuple(G.edges()))})
+def get_network_layout(G):
+    """Compute node positions, falling back to a sparse spectral layout for large graphs"""
+    if len(G) > 300:
+        # Fruchterman-Reingold is quadratic per iteration; one sparse eigensolve is far cheaper
+        return nx.spectral_layout(G)
+    return nx.spring_layout(G, k=1/np.sqrt(len(G)), iterations=50, seed=42)
+
 def create_network_graph(G, author_id):
     """Create interactive network visualization using Plotly"""
-    pos = nx.spring_layout(G, k=1/np.sqrt(len(G.nodes())), iterations=50)
+    pos = get_network_layout(G)
     
     # Calculate distances from main author
     distances = nx.single_source_shortest_path_length(G, author_id)
     
-    edge_x = []
-    edge_y = []
-    for edge in G.edges():
-        x0, y0 = pos[edge[0]]
-        x1, y1 = pos[edge[1]]
-        edge_x.extend([x0, x1, None])
-        edge_y.extend([y0, y1, None])
+    nodes = list(G.nodes())
+    node_index = {node: i for i, node in enumerate(nodes)}
+    coords = np.array([pos[node] for node in nodes], dtype=float).reshape(-1, 2)
+    
+    # One (source, target, gap) triple per edge; NaN breaks the line between edges
+    edges = np.array([(node_index[u], node_index[v]) for u, v in G.edges()], dtype=int).reshape(-1, 2)
+    segments = np.full((len(edges), 3, 2), np.nan)
+    segments[:, 0] = coords[edges[:, 0]]
+    segments[:, 1] = coords[edges[:, 1]]
+    
+    # CSR adjacency for the click handler: node i's neighbours are
+    # neighbors[offsets[i]:offsets[i + 1]], so a click reads O(degree) entries
+    directed = np.concatenate([edges, edges[:, ::-1]])
+    neighbors = directed[np.argsort(directed[:, 0], kind='stable'), 1]
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(directed[:, 0], minlength=len(nodes)))])
     
     edge_trace = go.Scatter(
-        x=edge_x, y=edge_y,
+        x=segments[:, :, 0].ravel(), y=segments[:, :, 1].ravel(),
         line=dict(width=0.5, color='#888'),
         hoverinfo='none',
         mode='lines')
     
-    node_x = []
-    node_y = []
-    node_colors = []
-    node_sizes = []
-    node_text = []
+    # Color scheme based on distance: yellow main author, dimmed nodes two edges away
+    is_main = np.array([node == author_id for node in nodes], dtype=bool)
+    is_near = np.array([distances.get(node, 2) < 2 for node in nodes], dtype=bool)
+    node_colors = np.where(is_main, '#FFFF00',
+                           np.where(is_near, 'rgba(255,255,255,1.0)', 'rgba(255,255,255,0.3)'))
+    node_sizes = np.where(is_main, 20, 15)
     
-    for node in G.nodes():
-        x, y = pos[node]
-        node_x.append(x)
-        node_y.append(y)
-        
-        # Color scheme based on distance
-        if node == author_id:
-            node_colors.append('#FFFF00')  # Yellow for main author
-            node_sizes.append(20)
-        else:
-            # Dim nodes that are two edges away
-            opacity = 1.0 if distances.get(node, 2) < 2 else 0.3
-            node_colors.append(f'rgba(255,255,255,{opacity})')  # White with opacity
-            node_sizes.append(15)
-        
-        # Hover text
-        if node == author_id:
-            node_text.append(f"Author: {G.nodes[node]['name']}<br>(Main Author)")
-        else:
-            node_text.append(f"Author: {G.nodes[node]['name']}")
+    # Hover text
+    node_text = [f"Author: {G.nodes[node]['name']}<br>(Main Author)" if node == author_id
+                 else f"Author: {G.nodes[node]['name']}" for node in nodes]
     
     node_trace = go.Scatter(
-        x=node_x, y=node_y,
+        x=coords[:, 0], y=coords[:, 1],
         mode='markers',
         hoverinfo='text',
         text=node_text,
+        customdata=np.column_stack([np.arange(len(nodes)), offsets[:-1], offsets[1:]]),
         marker=dict(
             color=node_colors,
             size=node_sizes,
@@ -630,11 +675,110 @@ def create_network_graph(G, author_id):
                        paper_bgcolor='#0E1117',
                        xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
                        yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-                       height=800
+                       height=800,
+                       meta=dict(neighbors=neighbors)
                    ))
     
     return fig
 
+@st.cache_data(ttl=86400, show_spinner=False)
+def build_institution_df(auth_df, author_id):
+    """Build the institution collaboration table for an author"""
+    institution_collabs = get_institution_collaborations(auth_df, author_id)
+    return count_values(institution_collabs, 'Institution', 'Number of Collaborations')
+
+def citing_fingerprint(citing_works):
+    """Cheap digest of the citing (id, year) pairs, used in place of the tuples as a cache key"""
+    if not citing_works:
+        return 0
+    frame = pd.DataFrame([work[:2] for work in citing_works], columns=['id', 'year'])
+    return int(pd.util.hash_pandas_object(frame, index=False).sum())
+
+@st.cache_data(ttl=86400, show_spinner=False)
+def build_figures(auth_df, _citing_works, _works_ids_set, author_id, citing_key):
+    """Build all publication and collaboration charts for an author, keyed by chart name"""
+    # Hashing the raw citing tuples costs more than building the chart, so they are
+    # excluded from the cache key; the author id and a digest of the citing ids stand in
+    # The builders are independent, so overlap their pandas/numpy work on a thread pool;
+    # workers carry the script context for the nested st.cache_data lookups
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(max_workers=6, initializer=add_script_run_ctx, initargs=(None, ctx)) as executor:
+        # Per-year collaborator and team-size aggregates shared by several charts
+        year_stats = executor.submit(build_year_stats, auth_df, author_id)
+        futures = {
+            'position': executor.submit(create_publication_position_chart, auth_df, author_id),
+        }
+        # Skip charts that would be empty; the caller shows a note instead
+        if _citing_works:
+            futures['citations'] = executor.submit(create_citation_chart, _citing_works, _works_ids_set)
+        if not get_collaborators(auth_df, author_id).empty:
+            futures['collaboration_distribution'] = executor.submit(
+                create_collaboration_distribution_chart, auth_df, author_id)
+        year_stats = year_stats.result()
+        futures['unique_collaborators'] = executor.submit(create_unique_collaborators_chart, year_stats)
+        futures['new_collaborators'] = executor.submit(create_new_collaborators_chart, year_stats)
+        futures['team_size'] = executor.submit(create_team_size_chart, year_stats)
+        return {name: future.result() for name, future in futures.items()}
+
+@st.cache_resource(ttl=86400, show_spinner=False)
+def build_network_fig(auth_df, author_id, author_name):
+    """Build the collaboration network figure once and share it across reruns"""
+    network = get_collaborator_network(auth_df, author_id, author_name)
+    return create_network_graph(network, author_id)
+
+@st.fragment
+def render_figures(auth_df, citing_works, works_ids_set, author_id):
+    """Render the analytics charts as a fragment, so reruns inside it skip the rest of the page"""
+    figures = build_figures(auth_df, citing_works, works_ids_set, author_id,
+                            citing_fingerprint(citing_works))
+    
+    # Publication position chart
+    col1, col2 = st.columns(2)
+    with col1:
+        st.plotly_chart(figures['position'], use_container_width=True, config=STATIC_CHART_CONFIG)
+    
+    with col2:
+        if 'citations' in figures:
+            st.plotly_chart(figures['citations'], use_container_width=True, config=STATIC_CHART_CONFIG)
+        else:
+            st.info("No citations found for this author.")
+    
+    col3, col4 = st.columns(2)
+    with col3:
+        # Unique collaborators chart
+        st.plotly_chart(figures['unique_collaborators'], use_container_width=True, config=STATIC_CHART_CONFIG)
+    
+    with col4:
+        # New collaborators chart
+        st.plotly_chart(figures['new_collaborators'], use_container_width=True, config=STATIC_CHART_CONFIG)
+    
+    # Create two columns for team size and collaboration distribution
+    col5, col6 = st.columns(2)
+    
+    with col5:
+        st.plotly_chart(figures['team_size'], use_container_width=True, config=STATIC_CHART_CONFIG)
+    
+    with col6:
+        if 'collaboration_distribution' in figures:
+            st.plotly_chart(figures['collaboration_distribution'], use_container_width=True, config=STATIC_CHART_CONFIG)
+        else:
+            st.info("No collaborators found for this author.")
+
+@st.fragment
+def render_network(auth_df, author_id, author_name):
+    """Render the collaboration network as a fragment, building it only once requested"""
+    st.subheader("Recent Collaboration Network")
+    # Expanding the network costs a round of API calls per frequent collaborator, so
+    # defer it until asked; the button only reruns this fragment
+    if st.session_state.get('network_author') != author_id:
+        if not st.button("Build collaboration network"):
+            return
+        st.session_state.network_author = author_id
+    
+    with st.spinner('Building collaboration network... this may take a while.'):
+        network_fig = build_network_fig(auth_df, author_id, author_name)
+        st.plotly_chart(network_fig, use_container_width=True, height=800)
+
 # Add this function to search authors
 @st.cache_data(ttl=86400, show_spinner=False)
 def search_authors(query):
@@ -643,9 +787,9 @@ def search_authors(query):
         return []
         
     url = f"https://api.openalex.org/authors?search={query}&per-page=10"
-    response = requests.get(url)
+    response = session.get(url, timeout=30)
     if response.status_code == 200:
-        results = response.json()['results']
+        results = parse_json(response)['results']
         # Format results for dropdown
         return [
             {
@@ -683,7 +827,9 @@ with st.container():
         label_visibility="collapsed"
     )
 
-    # Update search results when query changes
+    # Update search results when query changes; whitespace and case edits do not
+    # change OpenAlex results, so they neither trigger a new search nor miss the cache
+    search_query = ' '.join(search_query.split()).lower()
     if search_query != st.session_state.search_query:
         st.session_state.search_query = search_query
         if len(search_query) >= 3:  # Only search if query is meaningful
@@ -716,6 +862,12 @@ with st.container():
     # Process selected author
     if st.session_state.selected_author:
         author_id = st.session_state.selected_author['id']
+        # Works only need the OpenAlex id from the search result, so start paging them
+        # in the background while the author profile loads
+        prefetch = ThreadPoolExecutor(max_workers=1, initializer=add_script_run_ctx,
+                                      initargs=(None, get_script_run_ctx()))
+        works_future = prefetch.submit(get_works, author_id)
+        prefetch.shutdown(wait=False)
         # Get author data
         with st.spinner('Fetching author information...'):
             author_data = get_author_data(author_id)
@@ -725,8 +877,10 @@ with st.container():
             # Display author info
             st.subheader("Author Information")
             st.markdown(f"## Name: {author_data.get('display_name')}")
-            st.markdown(f"#### h-index: {author_data.get('summary_stats', {}).get('h_index', 'Not available')}")
-            st.markdown(f"#### i10-index: {author_data.get('summary_stats', {}).get('i10_index', 'Not available')}")
+            # summary_stats can be present but null
+            summary_stats = author_data.get('summary_stats') or {}
+            st.markdown(f"#### h-index: {summary_stats.get('h_index', 'Not available')}")
+            st.markdown(f"#### i10-index: {summary_stats.get('i10_index', 'Not available')}")
             
             institutions = get_institutions(author_data['affiliations'])
             st.markdown(f"#### Institutions: {', '.join(institutions)}")
@@ -734,145 +888,136 @@ with st.container():
             areas = get_areas(author_data)
             st.markdown(f"#### Research Areas: {', '.join(areas)}")
             
-            # Create an expander for all publication-related tables
-            with st.expander("Publication Analytics", expanded=True):
+            # One collapsed status box reports progress through the fetch and build phases
+            status = st.status("Building dashboard...", expanded=False)
+            
+            status.update(label='Fetching publication data...')
+            works = works_future.result()
+            # Nothing below has anything to show without publications
+            if not works:
+                status.update(label="No publications found", state="complete")
+                st.info("No publications found for this author.")
+                st.stop()
+            
+            # Tabs keep the charts and network out of the initial view
+            analytics_tab, figures_tab, network_tab = st.tabs(
+                ["Publication Analytics", "Figures", "Collaboration Network"]
+            )
+            
+            # All publication-related tables
+            with analytics_tab:
                 # Get and display works
                 
-                with st.spinner('Fetching publication data...'):
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        works = get_works(author_data['id'])
-                        works_ids = [work['id'] for work in works]
-                        works_df = pd.DataFrame([{
-                            'Title': w['title'],
-                            'Year': str(w['publication_year']),  # Convert to string to prevent comma formatting
-                            'Venue': get_venue(w),
-                            'Citations': w.get('cited_by_count', 0)
-                        } for w in works])
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    # Flattened authorships shared by the tables and charts below
+                    auth_df = flatten_authorships(works)
+                    works_ids_set = set(map(itemgetter('id'), works))  # O(1) self-citation lookups
+                    works_df = pd.DataFrame([{
+                        'Title': w['title'],
+                        'Year': str(w['publication_year']),  # Convert to string to prevent comma formatting
+                        'Venue': get_venue(w),
+                        'Citations': w.get('cited_by_count', 0)
+                    } for w in works]).astype({'Citations': 'int32'})
+                
+                    st.subheader("Publications")
+                    st.dataframe(
+                        works_df.sort_values('Citations', ascending=False),
+                        height=400,
+                        hide_index=True
+                    )
                     
-                        st.subheader("Publications")
-                        st.dataframe(
-                            works_df.sort_values('Citations', ascending=False),
-                            height=400,
-                            hide_index=True
-                        )
-                        
-                    with col2:
-                        st.subheader("Top Collaborators")
-                        collaborators = get_collaborators(works, author_data['id'])
-                        collab_counts = Counter(c['name'] for c in collaborators)
-                        collab_df = pd.DataFrame(
-                            collab_counts.most_common(len(collab_counts)),
-                            columns=['Collaborator', 'Number of Collaborations']
-                        )
+                with col2:
+                    st.subheader("Top Collaborators")
+                    collab_df = count_values(get_collaborators(auth_df, author_data['id']),
+                                             'Collaborator', 'Number of Collaborations')
+                    if collab_df.empty:
+                        st.info("No collaborators found.")
+                    else:
                         st.dataframe(collab_df, height=400, hide_index=True)
-                    
-                    # Display venues in second column
-                    with col3:
-                        st.subheader("Top Venues")
-                        venue_counts = Counter(work['Venue'] for _, work in works_df.iterrows())
-                        venue_df = pd.DataFrame(
-                            venue_counts.most_common(len(venue_counts)),
-                            columns=['Venue', 'Number of Publications']
-                        )
-                        venue_df = venue_df[venue_df['Venue'] != 'N/A']
+                
+                # Display venues in second column
+                with col3:
+                    st.subheader("Top Venues")
+                    venue_df = count_values(works_df.loc[works_df['Venue'] != 'N/A', 'Venue'],
+                                            'Venue', 'Number of Publications')
+                    if venue_df.empty:
+                        st.info("No venues found.")
+                    else:
                         st.dataframe(venue_df, height=400, hide_index=True)
                 
                 
-                with st.spinner(f"Fetching what papers cited {author_name}'s {len(works)} papers... "):
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        citing_works = get_citing_works_with_progress(works)
-                        citing_papers = [{
-                            "ID": work['id'],
-                            'Title': work['title'],
-                            'Venue': get_venue(work),
-                            'Is Self': 'True' if work['id'] in works_ids else 'False'
-                        } for work in citing_works]
-                        
-                        citing_freq = Counter(d['ID'] for d in citing_papers)
-                        
-                        # Create DataFrame with ID counts and merge with paper details
-                        citing_df = pd.DataFrame(
-                            [(paper_id, count) for paper_id, count in citing_freq.most_common()],
-                            columns=['ID', 'Incoming citations']
-                        )
-                        
-                        # Add paper details by matching IDs
-                        paper_details = pd.DataFrame(citing_papers)
-                        citing_df = citing_df.merge(
-                            paper_details[['ID', 'Title', 'Venue', 'Is Self']],
-                            on='ID',
-                            how='left'
-                        )
-                        # Reorder columns and drop ID
-                        citing_df = citing_df[['Title', 'Venue', 'Incoming citations', 'Is Self']]
-                        citing_df['Incoming citations'] = citing_df['Incoming citations'].astype(int)
+                status.update(label=f"Fetching what papers cited {author_name}'s {len(works)} papers...")
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.subheader("Most Frequent Citing Papers")
+                    progress_placeholder = st.empty()
+                    table_placeholder = st.empty()
+                    
+                    citing_works = load_citing_snapshot(author_data['id'])
+                    if citing_works is None:
+                        progress_bar = progress_placeholder.progress(0)
                         
-                        citing_df = citing_df.drop_duplicates()
-                        st.subheader("Most Frequent Citing Papers")
-                        st.dataframe(citing_df, height=400, hide_index=True)
+                        # Show partial results as batches arrive, re-rendering at doubling
+                        # intervals so the total re-render cost stays linear
+                        batches = {}
+                        all_complete = True
+                        next_render = 1
+                        for i, batch, complete, total in stream_citing_works(works):
+                            batches[i] = batch
+                            all_complete = all_complete and complete
+                            progress_bar.progress(len(batches) / total)
+                            if len(batches) == next_render and len(batches) < total:
+                                partial = [work for batch in batches.values() for work in batch]
+                                table_placeholder.dataframe(build_citing_df(partial, works_ids_set),
+                                                            height=400, hide_index=True)
+                                next_render *= 2
+                        progress_bar.empty()
                         
-                        # Calculate and display citation-concentration index
-                        c_index = calculate_citation_concentration_index(citing_df)
-                        st.markdown(f"#### Citation-concentration index = {c_index}", help=f"This means there are {c_index} papers that each cite this author {c_index} or more times")
-                        print(author_data.get('cited_by_count', 0))
-                        print(author_data.get('summary_stats', {}).get('h_index', 1))
-                        st.markdown(f"#### c/h² index = {author_data.get('cited_by_count', 0)/author_data.get('summary_stats', {}).get('h_index', 1)**2}", help=f"The c/h² index is a measure of the citation concentration of an author's papers. It is calculated by dividing the total number of citations by the square of the author's h-index. A lower c/h² index indicates that citations received by the author are concentrated in the papers which contribute to their h-index.")
-                        st.markdown(f"#### Self-citation rate = {round(citing_df.loc[citing_df['Is Self'] == 'True']['Incoming citations'].sum() * 100/citing_df['Incoming citations'].sum(), 2)}%", help=f"The self-citation rate is the percentage of citations that are to the author's own papers. A higher self-citation rate indicates that the author cites their own papers more frequently.")
-                    
-                    with col2:
-                        st.subheader("Most Frequent Institution Collaborations")
-                        institution_collabs = get_institution_collaborations(works, author_data['id'])
-                        inst_counts = Counter(i['name'] for i in institution_collabs)
-                        inst_df = pd.DataFrame(
-                            inst_counts.most_common(len(inst_counts)),
-                            columns=['Institution', 'Number of Collaborations']
-                        )
-                        st.dataframe(inst_df, height=400, hide_index=True)
-            # Create an expander for figures
-            with st.expander("Figures", expanded=True):
-                with st.spinner('Generating visualization charts...'):
-                    # Publication position chart
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        pub_fig = create_publication_position_chart(works, author_data['id'])
-                        st.plotly_chart(pub_fig, use_container_width=True)
-                    
-                    with col2:
-                        cite_fig = create_citation_chart(citing_works, works_ids)
-                        st.plotly_chart(cite_fig, use_container_width=True)
-                    
-                    col3, col4 = st.columns(2)
-                    with col3:
-                        # Unique collaborators chart
-                        collab_fig = create_unique_collaborators_chart(works, author_data['id'])
-                        st.plotly_chart(collab_fig, use_container_width=True)
+                        # Flatten in batch order so the output does not depend on completion order
+                        citing_works = [work for i in sorted(batches) for work in batches[i]]
+                        # A truncated fetch must not become the day's answer for every session
+                        if all_complete:
+                            save_citing_snapshot(author_data['id'], citing_works)
                     
-                    with col4:
-                    # New collaborators chart
-                        new_collab_fig = create_new_collaborators_chart(works, author_data['id'])
-                        st.plotly_chart(new_collab_fig, use_container_width=True)
+                    citing_df = build_citing_df(citing_works, works_ids_set)
+                    if citing_df.empty:
+                        table_placeholder.info("No citing papers found.")
+                    else:
+                        table_placeholder.dataframe(citing_df, height=400, hide_index=True)
                     
+                    # Calculate and display citation-concentration index
+                    c_index = calculate_citation_concentration_index(citing_df) if not citing_df.empty else 0
+                    st.markdown(f"#### Citation-concentration index = {c_index}", help=f"This means there are {c_index} papers that each cite this author {c_index} or more times")
                     
-                    team_size_fig = create_team_size_chart(works)
-                    
-                    # Create two columns for team size and collaboration distribution
-                    col5, col6 = st.columns(2)
-                    
-                    with col5:
-                        st.plotly_chart(team_size_fig, use_container_width=True)
-                    
-                    with col6:
-                        collab_dist_fig = create_collaboration_distribution_chart(works, author_data['id'])
-                        st.plotly_chart(collab_dist_fig, use_container_width=True)
-            
-            with st.expander("Collaboration Network", expanded = True):                        # Add network visualization here
-                st.subheader("Recent Collaboration Network")
-                with st.spinner('Building collaboration network... this may take a while.'):
-                    network = get_collaborator_network(works, author_data['id'], author_data.get('display_name'))
-                    network_fig = create_network_graph(network, author_data['id'])
-                    st.plotly_chart(network_fig, use_container_width=True, height=800)
+                    # An h-index of 0 (or a missing one) would divide by zero
+                    cited_by_count = author_data.get('cited_by_count', 0)
+                    h_index = summary_stats.get('h_index') or 1
+                    ch2_index = cited_by_count / (h_index * h_index)
+                    st.markdown(f"#### c/h² index = {ch2_index:.2f}", help=f"The c/h² index is a measure of the citation concentration of an author's papers. It is calculated by dividing the total number of citations by the square of the author's h-index. A lower c/h² index indicates that citations received by the author are concentrated in the papers which contribute to their h-index.")
+                    if citing_df.empty:
+                        self_citation_rate = 'n/a'
+                    else:
+                        # One grouped pass gives both the self and the total citation counts
+                        citation_sums = citing_df.groupby('Is Self', sort=False)['Incoming citations'].sum()
+                        self_citation_rate = f"{round(citation_sums.get(True, 0) * 100/citation_sums.sum(), 2)}%"
+                    st.markdown(f"#### Self-citation rate = {self_citation_rate}", help=f"The self-citation rate is the percentage of citations that are to the author's own papers. A higher self-citation rate indicates that the author cites their own papers more frequently.")
+                
+                with col2:
+                    st.subheader("Most Frequent Institution Collaborations")
+                    inst_df = build_institution_df(auth_df, author_data['id'])
+                    if inst_df.empty:
+                        st.info("No institution collaborations found.")
+                    else:
+                        st.dataframe(inst_df, height=400, hide_index=True)
+            # Charts and network render as fragments, so interacting with them
+            # does not re-execute the tables and metrics above
+            with figures_tab:
+                status.update(label='Generating visualization charts...')
+                render_figures(auth_df, citing_works, works_ids_set, author_data['id'])
+            status.update(label="Dashboard ready", state="complete")
+            with network_tab:
+                render_network(auth_df, author_data['id'], author_data.get('display_name'))
             
         else:
             st.error("Could not find author with this ORCID ID") 
@@ -884,31 +1029,21 @@ with st.container():
         if (graphDiv) {
             graphDiv.on('plotly_click', function(data) {
                 if (!data || !data.points || !data.points[0]) return;
+                // Only node points carry customdata; ignore clicks resolved to the edge trace
+                if (data.points[0].curveNumber !== 1) return;
                 
-                const clickedNode = data.points[0].customdata;
+                // customdata is [node index, neighbour start, neighbour end] into the CSR list
+                const [clickedNode, start, end] = data.points[0].customdata;
                 const graph = graphDiv.data[1];
-                const colors = [];
-                const neighbors = new Set();
-                
-                // Get neighbors of clicked node
-                for (let i = 0; i < graphDiv.data[0].x.length; i += 3) {
-                    const source = graphDiv.data[0].x[i];
-                    const target = graphDiv.data[0].x[i + 1];
-                    if (source === clickedNode) neighbors.add(target);
-                    if (target === clickedNode) neighbors.add(source);
-                }
+                const neighbors = graphDiv.layout.meta.neighbors;
                 
-                // Update colors
-                for (let i = 0; i < graph.marker.color.length; i++) {
-                    const nodeId = graph.customdata[i];
-                    if (nodeId === clickedNode) {
-                        colors.push('#FFFF00');  // Yellow for clicked node
-                    } else if (neighbors.has(nodeId)) {
-                        colors.push('#FFFFFF');  // White for neighbors
-                    } else {
-                        colors.push('rgba(255,255,255,0.3)');  // Dimmed for others
-                    }
+                // Update colors: node indices match trace positions, so start from a
+                // pre-sized dimmed array and overwrite only the clicked node's neighbourhood
+                const colors = new Array(graph.marker.color.length).fill('rgba(255,255,255,0.3)');
+                for (let i = start; i < end; i++) {
+                    colors[neighbors[i]] = '#FFFFFF';  // White for neighbors
                 }
+                colors[clickedNode] = '#FFFF00';  // Yellow for clicked node
                 
                 Plotly.restyle(graphDiv, {'marker.color': [colors]}, [1]);
             });